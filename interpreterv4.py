@@ -1,7 +1,19 @@
 from intbase import InterpreterBase, ErrorType
 from brewparse import parse_program
+from element import Element
 import enum
-import copy
+import gc
+import sys
+
+
+# opcodes for statements precompiled by Interpreter.__compile_statements
+OP_VARDEF = 0
+OP_BVARDEF = 1
+OP_ASSIGN = 2
+OP_FCALL = 3
+OP_IF = 4
+OP_WHILE = 5
+OP_RETURN = 6
 
 
 class Type(enum.Enum):
@@ -13,135 +25,303 @@ class Type(enum.Enum):
     OBJECT = 5
     FUNCTION = 6
 
+    # members are singletons, so hash by identity rather than Enum's hash of the member name
+    __hash__ = object.__hash__
+
+
+# ints in this range are served from a table of shared Values instead of being allocated
+SMALL_INT_MIN = -5
+SMALL_INT_MAX = 256
+
+# most free cells Environment keeps for reuse, so a deep recursion doesn't pin
+# its peak number of cells once it has unwound
+CELL_POOL_MAX = 4096
+
+# result types of int(...), str(...) and bool(...)
+STATIC_CONVERT_TYPES = {"int": Type.INT, "str": Type.STRING, "bool": Type.BOOL}
+
+# what assigning a value of a type to a variable/field of a type does, keyed by
+# (target type, value type, value.v is None); any missing combination is a type error
+ASSIGN_OK = 0
+ASSIGN_NIL = 1  # nil object/function: store the target type's own nil
+ASSIGN_TABLE = {
+    (Type.INT, Type.INT, False): ASSIGN_OK,
+    (Type.STRING, Type.STRING, False): ASSIGN_OK,
+    (Type.BOOL, Type.BOOL, False): ASSIGN_OK,
+    (Type.OBJECT, Type.OBJECT, False): ASSIGN_OK,
+    (Type.FUNCTION, Type.FUNCTION, False): ASSIGN_OK,
+    (Type.OBJECT, Type.OBJECT, True): ASSIGN_NIL,
+    (Type.OBJECT, Type.FUNCTION, True): ASSIGN_NIL,
+    (Type.FUNCTION, Type.OBJECT, True): ASSIGN_NIL,
+    (Type.FUNCTION, Type.FUNCTION, True): ASSIGN_NIL,
+}
+
+# how print renders values of each type; anything else goes through str
+PRINT_FORMATTERS = {
+    Type.INT: str,
+    Type.STRING: str,
+    Type.BOOL: lambda v: "true" if v else "false",
+}
+
+# Brewin operators as Python operators in specialized int loops
+INT_LOOP_ARITHMETIC = {"+": "+", "-": "-", "*": "*", "/": "//"}
+INT_LOOP_COMPARISONS = {"<", "<=", ">", ">=", "==", "!="}
+INT_LOOP_LOGIC = {"&&": "&", "||": "|"}
+
+
+class _NotIntLoop(Exception):
+    """A while loop does something other than int arithmetic on int variables"""
+
+
+# kinds of interface field specs: (IFACE_VAR, type, interface) or
+# (IFACE_FUNC, ((param type, param interface, is ref), ...))
+IFACE_VAR = 0
+IFACE_FUNC = 1
+
+# types of variables/fields by name suffix; a single uppercase suffix is an interface (an object)
+VAR_SUFFIX_TYPES = {
+    "i": Type.INT,
+    "s": Type.STRING,
+    "b": Type.BOOL,
+    "o": Type.OBJECT,
+    "f": Type.FUNCTION,
+}
+
 
 class Value:
-    def __init__(self, t=None, v=None):
+    # interface is None except on a default return value tagged with its interface
+    __slots__ = ("t", "v", "interface")
+
+    def __init__(self, t=None, v=None, interface=None):
         if t is None:
             self.t = Type.NIL
             self.v = None
         else:
             self.t = t
             self.v = v
+        self.interface = interface
+
+# Values are never mutated once built, so the common constants are shared by
+# every interpreter
+VOID_V = Value(Type.VOID, None)
+NIL_OBJ_V = Value(Type.OBJECT, None)
+NIL_FUNC_V = Value(Type.FUNCTION, None)
+FALSE_V = Value(Type.BOOL, False)
+TRUE_V = Value(Type.BOOL, True)
+EMPTY_STR_V = Value(Type.STRING, "")
+SMALL_INT_VALUES = [Value(Type.INT, i) for i in range(SMALL_INT_MIN, SMALL_INT_MAX + 1)]
+ZERO_V = SMALL_INT_VALUES[-SMALL_INT_MIN]
+
 
 class Cell:
-    def __init__(self, value: Value):
-        self.value = value
+    """Mutable box holding a variable's or field's current Value; shared by ref params and closures"""
+    __slots__ = ("value",)
 
-    def get(self) -> Value:
-        return self.value
-    
-    def set(self, value: Value):
+    def __init__(self, value: Value):
         self.value = value
 
 class FunctionValue:
+    __slots__ = ("func_ast", "param_types", "closure_env")
+
     def __init__(self, func_ast, param_types: tuple[Type, ...], closure_env=None):
         self.func_ast = func_ast
         self.param_types = tuple(param_types)
         self.closure_env = closure_env
 
 
-class Environment:
-    def __init__(self):
-        self.env = []
+class Scope:
+    """Compile-time slot layout of one function (or lambda) body.
 
-    def enter_block(self):
-        self.env[-1].append({})
+    Every function-scope name and every (block, name) pair declared with bvar
+    gets its own slot index, so a frame is just a list indexed by slot.
+    """
+    def __init__(self):
+        self.size = 0
+        self.param_slots = ()
+        self.self_slot = None
+        # every slot but the parameters, whose cells may belong to the caller
+        self.local_slots = ()
+        # name -> slots holding that name, innermost block first; used when a
+        # variable is looked up by name from another frame (callee or closure)
+        self.names = {}
+        self.slot_depths = []
+
+    def new_slot(self, name, depth):
+        slot = self.size
+        self.size += 1
+        self.slot_depths.append((depth, name, slot))
+        return slot
+
+    def finish(self):
+        names = {}
+        for depth, name, slot in sorted(self.slot_depths, reverse=True):
+            names.setdefault(name, []).append(slot)
+        self.names = {name: tuple(slots) for name, slots in names.items()}
+        self.local_slots = tuple(slot for slot in range(self.size) if slot not in self.param_slots)
+
+
+class Frame:
+    __slots__ = ("scope", "slots")
+
+    def __init__(self, scope, slots=None):
+        self.scope = scope
+        self.slots = [None] * scope.size if slots is None else slots
 
-    def exit_block(self):
-        self.env[-1].pop()
 
-    def enter_func(self):
-        self.env.append([{}])
+class Environment:
+    def __init__(self):
+        self.env = []
+        # slot list of the running function's frame (env[-1]), kept as a frame pointer
+        self.slots = None
+        # cells of exited blocks/functions, reused by fdef_slot. Only cells made by
+        # fdef_slot go here: ref params alias the caller's cell, and lambdas capture
+        # copies, so nothing else can still hold them
+        self.cell_free = []
+
+    def exit_block(self, block_slots):
+        slots = self.slots
+        free = self.cell_free
+        for slot in block_slots:
+            cell = slots[slot]
+            if cell is not None:
+                if len(free) < CELL_POOL_MAX:
+                    free.append(cell)
+                slots[slot] = None
+
+    def enter_func(self, scope):
+        frame = Frame(scope)
+        self.env.append(frame)
+        self.slots = frame.slots
 
     def exit_func(self):
-        self.env.pop()
-
-    # define new variable at function scope
-    # def fdef(self, varname):
-    #     if self.exists(varname):
-    #         return False
-    #     top_env = self.env[-1]
-    #     top_env[0][varname] = Value()
-    #     return True
-
-    def fdef_function(self, varname, initial_value: Value):
-        if self.exists_in_function_scope(varname):
-            return False
-        top_env = self.env[-1]
-        # top_env[0][varname] = initial_value
-        top_env[0][varname] = Cell(initial_value)
-        return True
-    
-    def fdef_function_cell(self, varname, cell: Cell):
-        if self.exists_in_function_scope(varname):
+        env = self.env
+        frame = env.pop()
+        self.slots = env[-1].slots if env else None
+        slots = frame.slots
+        free = self.cell_free
+        for slot in frame.scope.local_slots:
+            cell = slots[slot]
+            if cell is not None:
+                if len(free) >= CELL_POOL_MAX:
+                    break
+                free.append(cell)
+
+    def swap_stack(self, env):
+        """Make env (e.g. a closure's captured frames) the frame stack; returns the previous one"""
+        previous = self.env
+        self.env = env
+        self.slots = env[-1].slots if env else None
+        return previous
+
+    def fdef_slot(self, slot, initial_value: Value):
+        slots = self.slots
+        if slots[slot] is not None:
             return False
-        top_env = self.env[-1]
-        top_env[0][varname] = cell
+        free = self.cell_free
+        if free:
+            cell = free.pop()
+            cell.value = initial_value
+            slots[slot] = cell
+        else:
+            slots[slot] = Cell(initial_value)
         return True
-    
-    def fdef_block(self, varname, initial_value: Value):
-        if self.exists_in_current_block(varname):
+
+    def fdef_slot_cell(self, slot, cell: Cell):
+        slots = self.slots
+        if slots[slot] is not None:
             return False
-        top_env = self.env[-1]
-        top_env[-1][varname] = Cell(initial_value)
-        # top_env[-1][varname] = initial_value
+        slots[slot] = cell
         return True
-    
-    def get_current_cell(self, varname):
-        # top_env = self.env[-1]
-        for frame in reversed(self.env):
-            for block in reversed(frame):
-                if varname in block:
-                    return block[varname]  
-        return None
 
-    def exists(self, varname):
-        for frame in reversed(self.env):
-            for block in reversed(frame):
-                if varname in block:
-                    return True
-        return False
-    
-    def exists_in_current_block(self, varname):
-        return varname in self.env[-1][-1]
-    
-    def exists_in_function_scope(self, varname):
-        return varname in self.env[-1][0]
-
-    def get(self, varname):
-        top_env = self.env[-1]
-        for block in reversed(top_env):
-            if varname in block:
-                return block[varname].value
+    def get_current_cell(self, varname, slots):
+        frame_slots = self.slots
+        for slot in slots:
+            cell = frame_slots[slot]
+            if cell is not None:
+                return cell
+        # not bound in the running function: look through the enclosing frames by name
+        env = self.env
+        for i in range(len(env) - 2, -1, -1):
+            frame = env[i]
+            for slot in frame.scope.names.get(varname, ()):
+                cell = frame.slots[slot]
+                if cell is not None:
+                    return cell
         return None
 
-    def set(self, varname, value):
-        # if not self.exists(varname):
-        #     return False
-        for frame in reversed(self.env):
-            for block in reversed(frame):
-                if varname in block:
-                    block[varname].value = value
-                    return True
-        return False
-
 class Interpreter(InterpreterBase):
     def __init__(self, console_output=True, inp=None, trace_output=False):
         super().__init__(console_output, inp)
         self.funcs = {}
+        self._funcs_by_name = {}
+        self._funcs_by_arity = {}
+        # (name, ((arg type, arg is nil), ...)) -> overload a free-function call resolved to
+        self._resolve_cache = {}
         self.env = Environment()
         self.bops = {"+", "-", "*", "/", "==", "!=", ">", ">=", "<", "<=", "||", "&&"}
         self.current_return_type = Type.VOID
-        self.heap = {}
-        self.next_obj_id = 1
+        # object fields, indexed by object id - 1 (ids are handed out densely from 1)
+        self.heap = []
         self.current_return_interface = None
         self.interfaces = {}
+        # (interface name, object id) -> dependencies of a successful interface check
+        self._iface_cache = {}
+        # name -> the type / interface its suffix denotes (None if it has none)
+        self._name_types = {}
+        self._name_interfaces = {}
+        # handlers for precompiled statements, indexed by opcode
+        self._dispatch = [
+            self.__run_vardef,
+            self.__run_vardef,
+            self.__run_assign,
+            self.__run_fcall_statement,
+            self.__run_if,
+            self.__run_while,
+            self.__run_return,
+        ]
+        # expression evaluators by node type
+        self._expr_dispatch = {
+            self.FUNC_NODE: self.__eval_lambda,
+            self.INT_NODE: self.__eval_int,
+            self.STRING_NODE: self.__eval_string,
+            self.BOOL_NODE: self.__eval_bool,
+            self.NIL_NODE: self.__eval_nil,
+            "@": self.__eval_new_object,
+            "convert": self.__eval_convert,
+            self.QUALIFIED_NAME_NODE: self.__eval_qname,
+            self.FCALL_NODE: self.__run_fcall,
+            self.NEG_NODE: self.__eval_neg,
+            self.NOT_NODE: self.__eval_not,
+        }
+        for op in self.bops:
+            self._expr_dispatch[op] = self.__eval_binary
+        # (operator, left type, right type) -> evaluator of the raw operand values;
+        # == and != work across types and are handled by __eval_equality instead
+        int_value = self.int_value
+        true, false = TRUE_V, FALSE_V
+        INT, STRING, BOOL = Type.INT, Type.STRING, Type.BOOL
+        self._binops = {
+            ("+", INT, INT): lambda a, b: int_value(a + b),
+            ("-", INT, INT): lambda a, b: int_value(a - b),
+            ("*", INT, INT): lambda a, b: int_value(a * b),
+            ("/", INT, INT): lambda a, b: int_value(a // b),
+            ("<", INT, INT): lambda a, b: true if a < b else false,
+            ("<=", INT, INT): lambda a, b: true if a <= b else false,
+            (">", INT, INT): lambda a, b: true if a > b else false,
+            (">=", INT, INT): lambda a, b: true if a >= b else false,
+            ("+", STRING, STRING): lambda a, b: Value(STRING, a + b),
+            ("&&", BOOL, BOOL): lambda a, b: true if a and b else false,
+            ("||", BOOL, BOOL): lambda a, b: true if a or b else false,
+        }
+
+    def int_value(self, i: int) -> Value:
+        if SMALL_INT_MIN <= i <= SMALL_INT_MAX:
+            return SMALL_INT_VALUES[i - SMALL_INT_MIN]
+        return Value(Type.INT, i)
 
     def new_object(self) -> Value:
-        obj_id = self.next_obj_id
-        self.next_obj_id += 1
-        self.heap[obj_id] = {}
-        return Value(Type.OBJECT, obj_id)
+        self.heap.append({})
+        return Value(Type.OBJECT, len(self.heap))
     
     def interface_from_suffix(self, suffix:str):
         if suffix.isupper():
@@ -164,40 +344,63 @@ class Interpreter(InterpreterBase):
             return False
         if val.v is None:
             return True
+        return self.interface_dependencies(interface_name, val) is not None
+
+    def interface_dependencies(self, interface_name:str, val:Value):
+        """Check a non-nil object against an interface, memoizing successful checks.
+
+        Returns None if the object doesn't satisfy the interface, otherwise the
+        (field cell, Value) pairs the result depends on. Fields are never removed
+        and their types are fixed by their names, so a cached success stays valid
+        while each of those cells still holds the same (immutable) Value, however
+        the field was written.
+        """
+        key = (interface_name, val.v)
+        deps = self._iface_cache.get(key)
+        if deps is not None:
+            for cell, field_val in deps:
+                if cell.value is not field_val:
+                    break
+            else:
+                return deps
+        deps = []
+        if not self.__check_interface(interface_name, val, deps):
+            return None
+        deps = tuple(deps)
+        self._iface_cache[key] = deps
+        return deps
+
+    def __check_interface(self, interface_name:str, val:Value, deps) -> bool:
         if interface_name not in self.interfaces:
-            super().error(ErrorType.NAME_ERROR, "unknown interface in object_satisfies_interface")
-        interface = self.interfaces[interface_name]
-        object_fields = self.heap.get(val.v)
-        if object_fields is None:
-            super().error(ErrorType.FAULT_ERROR, "invalid object reference in object_satisfies_interface")
-        for fname, spec in interface["fields"].items():
-            if fname not in object_fields:
+            self.error(ErrorType.NAME_ERROR, "unknown interface in object_satisfies_interface")
+        object_fields = self.heap[val.v - 1]
+        for fname, spec in self.interfaces[interface_name]:
+            field_cell = object_fields.get(fname)
+            if field_cell is None:
                 return False
-            field_val = object_fields[fname].get()
-            if spec["kind"] == "var":
-                if field_val.t != spec["type"]:
+            field_val = field_cell.value
+            if spec[0] == IFACE_VAR:
+                if field_val.t != spec[1]:
                     return False
-                finterface = spec["interface"]
+                finterface = spec[2]
                 if finterface is not None:
                     if field_val.t != Type.OBJECT:
                         return False
-                    if not self.object_satisfies_interface(finterface, field_val):
-                        return False
-            elif spec["kind"] == "func":
+                    deps.append((field_cell, field_val))
+                    if field_val.v is not None:
+                        nested_deps = self.interface_dependencies(finterface, field_val)
+                        if nested_deps is None:
+                            return False
+                        deps.extend(nested_deps)
+            elif spec[0] == IFACE_FUNC:
                 if field_val.t != Type.FUNCTION or field_val.v is None:
                     return False
-                func_def = field_val.v.func_ast
-                formal_params = func_def.get("args")
-                required_params = spec["params"]
-                if len(formal_params) != len(required_params):
+                deps.append((field_cell, field_val))
+                actual_params = field_val.v.func_ast.dict["param_specs"]
+                required_params = spec[1]
+                if len(actual_params) != len(required_params):
                     return False
-                for formal, required in zip(formal_params, required_params):
-                    actual_type = formal.dict["declared_type"]
-                    actual_interface = formal.dict["interface"]
-                    actual_ref = formal.get("ref")
-                    required_type = required["type"]
-                    required_interface = required["interface"]
-                    required_ref = required["ref"]
+                for (actual_type, actual_interface, actual_ref), (required_type, required_interface, required_ref) in zip(actual_params, required_params):
                     if actual_ref != required_ref:
                         return False
                     if required_type == Type.OBJECT and required_interface is None:
@@ -213,8 +416,12 @@ class Interpreter(InterpreterBase):
                 return False    
         return True
     def interface_from_name(self, name:str):
-        suffix = name[-1]
-        return self.interface_from_suffix(suffix)
+        try:
+            return self._name_interfaces[name]
+        except KeyError:
+            interface = self.interface_from_suffix(name[-1])
+            self._name_interfaces[name] = interface
+            return interface
     
     def is_nil_object(self, val:Value)->bool:
         return val.t == Type.OBJECT and val.v is None
@@ -222,229 +429,142 @@ class Interpreter(InterpreterBase):
     def is_nil_value(self, val:Value)->bool:
         return (val.t in (Type.OBJECT, Type.FUNCTION) and val.v is None)
     
-    def get_qname_value(self, qname:str) ->Value:
-        cell = self.get_qname_cell(qname)
-        return cell.get()
+    def get_qname_value(self, info, slots) ->Value:
+        return self.get_qname_cell_and_owner(info, slots)[0].value
+
+    def static_type_from_name(self, name: str):
+        """Like type_from_name, but returns None for an invalid suffix instead of raising"""
+        try:
+            return self._name_types[name]
+        except KeyError:
+            suffix = name[-1]
+            t = VAR_SUFFIX_TYPES.get(suffix)
+            if t is None and suffix.isupper():
+                t = Type.OBJECT
+            self._name_types[name] = t
+            return t
+
+    def qname_info(self, qname: str):
+        """Split a qualified name and resolve the types it is checked against, once.
+
+        Returns (parts, base_type, ((field, field_type), ...) for the intermediate
+        fields, final_type, final_interface). Invalid suffixes resolve to None so
+        the access still fails with a type error when it is executed.
+        """
+        parts = tuple(sys.intern(part) for part in qname.split('.'))
+        final_name = parts[-1]
+        intermediates = tuple((field, self.static_type_from_name(field)) for field in parts[1:-1])
+        return (
+            parts,
+            self.static_type_from_name(parts[0]),
+            intermediates,
+            self.static_type_from_name(final_name),
+            self.interface_from_name(final_name),
+        )
+
+    def resolve_qname(self, node, attr="name"):
+        info = node.dict.get("__qname")
+        if info is None:
+            info = self.qname_info(node.dict[attr])
+            node.dict["__qname"] = info
+        return info
 
     def make_named_function_value(self, name:str) ->Value:
-        potential = []
-        for (fname, ptypes), func in self.funcs.items():
-            if fname == name:
-                potential.append(func)
+        potential = self._funcs_by_name.get(name, ())
 
         if len(potential) == 0:
-            super().error(ErrorType.NAME_ERROR, "function wasnt found!!!!!!!!!!!!!!!!")
+            self.error(ErrorType.NAME_ERROR, "function wasnt found!!!!!!!!!!!!!!!!")
         if len(potential) > 1:
-            super().error(ErrorType.NAME_ERROR, "ambiguous function name!!!!!!!!!!!!!!!!")
+            self.error(ErrorType.NAME_ERROR, "ambiguous function name!!!!!!!!!!!!!!!!")
         # if not potential:
-        #     super().error(ErrorType.NAME_ERROR, "function wasnt found!!!!!!!!!!!!!!!!")
+        #     self.error(ErrorType.NAME_ERROR, "function wasnt found!!!!!!!!!!!!!!!!")
         func_def = potential[0]
         param_types = func_def.dict["param_types"]
         func_val = FunctionValue(func_def, param_types, closure_env=None)
         return Value(Type.FUNCTION, func_val)
 
-    def get_qname_cell_and_owner(self, qname:str):
-        parts = qname.split('.')
-        base_name = parts[0]
-        if not self.env.exists(base_name):
-            super().error(ErrorType.NAME_ERROR, "variable not defined")
+    def __deref(self, val: Value):
+        if val.t != Type.OBJECT:
+            self.error(ErrorType.TYPE_ERROR, "base of da dot is not an object")
+        if val.v is None:
+            self.error(ErrorType.FAULT_ERROR, "nil derefeerence in dotted access")
+        return self.heap[val.v - 1]
+
+    def __walk_qname(self, info, base_cell):
+        """Follows a dotted name from its base variable to the object holding its final field; returns (object, its fields)"""
+        OBJECT = Type.OBJECT
+        if info[1] != OBJECT:
+            self.error(ErrorType.TYPE_ERROR, "qualified name base is not an object")
+        heap = self.heap
+        current_val = base_cell.value
+        for field, field_type in info[2]:
+            if current_val.t != OBJECT or current_val.v is None:
+                self.__deref(current_val)  # raises the type or fault error
+            field_cell = heap[current_val.v - 1].get(field)
+            if field_cell is None:
+                self.error(ErrorType.NAME_ERROR, "field not defined")
+            current_val = field_cell.value
+            if field_type != OBJECT:
+                self.error(ErrorType.TYPE_ERROR, "intermediate dotted field must be object typed")
+        return current_val, self.__deref(current_val)
+
+    def get_qname_cell_and_owner(self, info, slots):
+        parts = info[0]
+        cell = self.env.get_current_cell(parts[0], slots)
+        if cell is None:
+            self.error(ErrorType.NAME_ERROR, "variable not defined")
         if len(parts) == 1:
-            cell = self.env.get_current_cell(base_name)
-            if cell is None:
-                super().error(ErrorType.NAME_ERROR, "variable not defined")
             return cell, None
-        if self.type_from_name(base_name) != Type.OBJECT:
-            super().error(ErrorType.TYPE_ERROR, "qualified name base is not an object")
-        base_cell = self.env.get_current_cell(base_name)
-        
-        if base_cell is None:
-            super().error(ErrorType.NAME_ERROR, "variable not defined")
-        current_val = base_cell.get()
-        intermediates = parts[1:-1]
-        final_field = parts[-1]
-        owner_object_value = None
-        for field in intermediates:
-            if current_val.t != Type.OBJECT:
-                super().error(ErrorType.TYPE_ERROR, "intermediate of da dot is not an object")
-            if current_val.v is None:
-                super().error(ErrorType.FAULT_ERROR, "nil derefeerence in dotted access")
-            obj_fields = self.heap.get(current_val.v)
-            if obj_fields is None:
-                super().error(ErrorType.FAULT_ERROR, "invalid object reference")
-            if field not in obj_fields:
-                super().error(ErrorType.NAME_ERROR, "field not defined")
-            field_cell = obj_fields[field]
-            current_val = field_cell.get()
-            if self.type_from_name(field) == Type.OBJECT:
-                owner_object_value = current_val
-        if current_val.t != Type.OBJECT:
-            super().error(ErrorType.TYPE_ERROR, "final base of da dot is not an object")
-        if current_val.v is None:
-            super().error(ErrorType.FAULT_ERROR, "nil derefeerence in dotted access")
-        obj_fields = self.heap.get(current_val.v)
-        if obj_fields is None:
-            super().error(ErrorType.FAULT_ERROR, "invalid object reference")
-        if final_field not in obj_fields:
-            super().error(ErrorType.NAME_ERROR, "field not defined")
-        return obj_fields[final_field], current_val
-        
-        
-
-    def get_qname_cell(self, qname:str)->Cell:
-        parts = qname.split('.')
-        base_name = parts[0]
-        if not self.env.exists(base_name):
-            super().error(ErrorType.NAME_ERROR, "variable not defined")
-        if len(parts) == 1:
-            cell = self.env.get_current_cell(base_name)
-            if cell is None:
-                super().error(ErrorType.NAME_ERROR, "variable not defined")
-            return cell
-
-        if self.type_from_name(base_name) != Type.OBJECT:
-            super().error(ErrorType.TYPE_ERROR, "qualified name base is not an object")
-        base_cell = self.env.get_current_cell(base_name)
-        
-        if base_cell is None:
-            super().error(ErrorType.NAME_ERROR, "variable not defined")
-        current_val = base_cell.get()
-        intermediates = parts[1:-1]
-        final_field = parts[-1]
-        for field in intermediates:
-            if current_val.t != Type.OBJECT:
-                super().error(ErrorType.TYPE_ERROR, "intermediate of da dot is not an object")
-            if current_val.v is None:
-                super().error(ErrorType.FAULT_ERROR, "nil derefeerence in dotted access")
-            obj_fields = self.heap.get(current_val.v)
-            if obj_fields is None:
-                super().error(ErrorType.FAULT_ERROR, "invalid object reference")
-            if field not in obj_fields:
-                super().error(ErrorType.NAME_ERROR, "field not defined")
-            field_cell = obj_fields[field]
-            current_val = field_cell.get()
-            if self.type_from_name(field) != Type.OBJECT:
-                super().error(ErrorType.TYPE_ERROR, "intermediate dotted field must be object typed")
-        if current_val.t != Type.OBJECT:
-            super().error(ErrorType.TYPE_ERROR, "final base of da dot is not an object")
-        if current_val.v is None:
-            super().error(ErrorType.FAULT_ERROR, "nil derefeerence in dotted access")
-        
-        obj_fields = self.heap.get(current_val.v)
-        if obj_fields is None:
-            super().error(ErrorType.FAULT_ERROR, "invalid object reference")
-        if final_field not in obj_fields:
-            super().error(ErrorType.NAME_ERROR, "field not defined")
-        return obj_fields[final_field]
+        owner, obj_fields = self.__walk_qname(info, cell)
+        cell = obj_fields.get(parts[-1])
+        if cell is None:
+            self.error(ErrorType.NAME_ERROR, "field not defined")
+        return cell, owner
+
+    def get_qname_cell(self, info, slots)->Cell:
+        return self.get_qname_cell_and_owner(info, slots)[0]
     
-    def interface_for_qname(self, qname:str):
-        parts = qname.split(".")
-        if len(parts) == 1:
-            return self.interface_from_name(parts[0])
-        else:
-            field_name = parts[-1]
-            return self.interface_from_name(field_name)
+    def interface_for_qname(self, info):
+        return info[4]
     
-    def set_qname_value(self, qname:str, value:Value):
-        parts = qname.split('.')
-        base_name = parts[0]
-        if not self.env.exists(base_name):
-            super().error(ErrorType.NAME_ERROR, "variable not defined")
+    def set_qname_value(self, info, slots, value:Value):
+        parts, base_type, intermediates, final_type, expected_interface = info
+        cell = self.env.get_current_cell(parts[0], slots)
+        if cell is None:
+            self.error(ErrorType.NAME_ERROR, "variable not defined")
         if len(parts) == 1:
-            left_type = self.type_from_name(base_name)
-            expected_interface = self.interface_from_name(base_name)
-
-            if value.v is None and value.t in (Type.OBJECT, Type.FUNCTION):
-                if left_type in (Type.OBJECT, Type.FUNCTION):
-                    value = Value(left_type, None)
-                else:
-                    super().error(ErrorType.TYPE_ERROR, "type mismatch in assignment 224")
-            else:
-                if left_type == Type.OBJECT:
-                    if value.t != Type.OBJECT:
-                        super().error(ErrorType.TYPE_ERROR, "u trying to assign non object to an object !")
-                elif left_type == Type.FUNCTION:
-                    if value.t != Type.FUNCTION:
-                        super().error(ErrorType.TYPE_ERROR, "u trying to assign non function to a function !")
-                else:
-                    if left_type != value.t:
-                        super().error(ErrorType.TYPE_ERROR, "type mismatch in assignment 234")
+            action = ASSIGN_TABLE.get((final_type, value.t, value.v is None))
+            if action is None:
+                self.error(ErrorType.TYPE_ERROR, "type mismatch in assignment")
+            if action == ASSIGN_NIL:
+                value = self.default_value_for_type(final_type)
 
             # value_interface = getattr(value, "interface", None)
             # # if not self.compatible_interfaces(expected_interface, value_interface, value):
-            # #     super().error(ErrorType.TYPE_ERROR, "interface mismatch in assignment")      
+            # #     self.error(ErrorType.TYPE_ERROR, "interface mismatch in assignment")      
             # if(expected_interface is not None and value_interface is None and value.v is not None and
             #    value.t in (Type.OBJECT, Type.FUNCTION)):
             #     setattr(value, "interface", expected_interface)
             #     value_interface = expected_interface
 
             # if not self.compatible_interfaces(expected_interface, value_interface, value):
-            #     super().error(ErrorType.TYPE_ERROR, "interface mismatch in assignment")
+            #     self.error(ErrorType.TYPE_ERROR, "interface mismatch in assignment")
 
             if expected_interface is not None:
                 if not self.object_satisfies_interface(expected_interface, value):
-                    super().error(ErrorType.TYPE_ERROR, "interface mismatch in assignment")
+                    self.error(ErrorType.TYPE_ERROR, "interface mismatch in assignment")
 
-            cell = self.env.get_current_cell(base_name)
-            if cell is None:
-                super().error(ErrorType.NAME_ERROR, "variable not defined")
-            cell.set(value)
+            cell.value = value
             return
             
-        if self.type_from_name(base_name) != Type.OBJECT:
-            super().error(ErrorType.TYPE_ERROR, "base of da dot assignment must be object-typed")
-
-        base_cell = self.env.get_current_cell(base_name)
-        if base_cell is None:
-            super().error(ErrorType.NAME_ERROR, "variable not defined")
-
-        current_val = base_cell.get()
-        intermediates = parts[1:-1]
+        obj_fields = self.__walk_qname(info, cell)[1]
         final_field = parts[-1]
-        for field in intermediates:
-            if current_val.t != Type.OBJECT:
-                super().error(ErrorType.TYPE_ERROR, "intermediate of da dot is not an object")
-            if current_val.v is None:
-                super().error(ErrorType.FAULT_ERROR, "nil derefeerence in dotted assignment")
-
-            obj_fields = self.heap.get(current_val.v)
-            if obj_fields is None:
-                super().error(ErrorType.FAULT_ERROR, "invalid object reference")
-            if field not in obj_fields:
-                super().error(ErrorType.NAME_ERROR, "field not defined")
-
-            field_cell = obj_fields[field]
-            current_val = field_cell.get()
-
-            if self.type_from_name(field) != Type.OBJECT:
-                super().error(ErrorType.TYPE_ERROR, "intermediate dotted field must be object typed")
-
-        if current_val.t != Type.OBJECT:
-            super().error(ErrorType.TYPE_ERROR, "final base of da dot is not an object")
-        if current_val.v is None:
-            super().error(ErrorType.FAULT_ERROR, "nil derefeerence in dotted assignment")
-
-        obj_fields = self.heap.get(current_val.v)
-        if obj_fields is None:
-            super().error(ErrorType.FAULT_ERROR, "invalid object reference")
-
-        final_type = self.type_from_name(final_field)
-        expected_interface = self.interface_from_name(final_field)
 
-        if value.v is None and value.t in (Type.OBJECT, Type.FUNCTION):
-            if final_type in (Type.OBJECT, Type.FUNCTION):
-                value = Value(final_type, None)
-            else:
-                super().error(ErrorType.TYPE_ERROR, "type mismatch in assignment 284")
-        else:
-            if final_type == Type.OBJECT:
-                if value.t != Type.OBJECT:
-                    super().error(ErrorType.TYPE_ERROR, "cannot assign nonobject to object")
-            elif final_type == Type.FUNCTION:
-                if value.t != Type.FUNCTION:
-                    super().error(ErrorType.TYPE_ERROR, "cannot assign nonfunction to function")
-            else:
-                if final_type != value.t:
-                    super().error(ErrorType.TYPE_ERROR, "type mismatch in assignment 294")
+        action = ASSIGN_TABLE.get((final_type, value.t, value.v is None))
+        if action is None:
+            self.error(ErrorType.TYPE_ERROR, "type mismatch in dotted assignment")
+        if action == ASSIGN_NIL:
+            value = self.default_value_for_type(final_type)
 
         # value_interface = getattr(value, "interface", None)
         # if(expected_interface is not None and value_interface is None and value.v is not None and
@@ -452,20 +572,20 @@ class Interpreter(InterpreterBase):
         #     setattr(value, "interface", expected_interface)
         #     value_interface = expected_interface
         # if not self.compatible_interfaces(expected_interface, value_interface, value):
-        #     super().error(ErrorType.TYPE_ERROR, "interface mismatch in assignment")        
+        #     self.error(ErrorType.TYPE_ERROR, "interface mismatch in assignment")        
         if expected_interface is not None:
             if not self.object_satisfies_interface(expected_interface, value):
-                super().error(ErrorType.TYPE_ERROR, "interface mismatch in assignment")    
+                self.error(ErrorType.TYPE_ERROR, "interface mismatch in assignment")    
         if final_field in obj_fields:
-            obj_fields[final_field].set(value)
+            obj_fields[final_field].value = value
         else:
             obj_fields[final_field] = Cell(value)
         # if final_type == Type.OBJECT:
         #     if value.t != Type.OBJECT:
-        #         super().error(ErrorType.TYPE_ERROR, "cannot assign non-object to object field")
+        #         self.error(ErrorType.TYPE_ERROR, "cannot assign non-object to object field")
         # else:
         #     if final_type != value.t:
-        #         super().error(ErrorType.TYPE_ERROR, "type mismatch in assignment")
+        #         self.error(ErrorType.TYPE_ERROR, "type mismatch in assignment")
 
         # if final_field in obj_fields:
         #     obj_fields[final_field].set(value)
@@ -476,26 +596,35 @@ class Interpreter(InterpreterBase):
         ast = parse_program(program)
         self.create_interface_table(ast)
         self.__create_function_table(ast)
+        self.__compile_functions()
         # self.__run_fcall(self.__get_function("main"))
         main_def=self.__get_function("main", tuple())
         self.current_return_type = main_def.dict["return_type"]
         self.current_return_interface = main_def.dict["return_interface"]
-        self.__run_fcall(main_def)
+        # the interpreter churns through short-lived cells and values but rarely
+        # makes cycles, so the cycle collector is pure overhead while a program runs
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.__run_fcall(main_def)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
 
     def default_value_for_type(self, t: Type) -> Value:
         if t == Type.INT:
-            return Value(Type.INT, 0)
+            return ZERO_V
         if t == Type.STRING:
-            return Value(Type.STRING, "")
+            return EMPTY_STR_V
         if t == Type.BOOL:
-            return Value(Type.BOOL, False)
+            return FALSE_V
         if t == Type.OBJECT:
-            return Value(Type.OBJECT, None)
+            return NIL_OBJ_V
         if t == Type.FUNCTION:
-            return Value(Type.FUNCTION, None)
+            return NIL_FUNC_V
         if t == Type.VOID:
-            return Value(Type.VOID, None)
-        super().error(ErrorType.TYPE_ERROR, "unknown type for default value")
+            return VOID_V
+        self.error(ErrorType.TYPE_ERROR, "unknown type for default value")
 
     def type_from_suffix(self, suffix: str, is_func: bool) -> Type:
         if suffix == "i":
@@ -512,7 +641,7 @@ class Interpreter(InterpreterBase):
             return Type.VOID
         if suffix.isupper() and len(suffix) == 1:
             return Type.OBJECT
-        super().error(ErrorType.TYPE_ERROR, "unknown type suffix")
+        self.error(ErrorType.TYPE_ERROR, "unknown type suffix")
 
     def create_interface_table(self, ast):
         self.interfaces = {}
@@ -520,20 +649,20 @@ class Interpreter(InterpreterBase):
         for interface_node in interface_nodes:
             name = interface_node.get("name")
             if not (name.isupper() and len(name) == 1 and isinstance(name,str)):
-                super().error(ErrorType.NAME_ERROR, "invalid interface name")
+                self.error(ErrorType.NAME_ERROR, "invalid interface name")
             if name in self.interfaces:
-                super().error(ErrorType.NAME_ERROR, "interface defined more than once")
+                self.error(ErrorType.NAME_ERROR, "interface defined more than once")
             fields_info = {}
             for field in interface_node.get("fields"):
                 fname = field.get("name")
                 if fname in fields_info:
-                    super().error(ErrorType.NAME_ERROR, "field defined more than once in interface")
+                    self.error(ErrorType.NAME_ERROR, "field defined more than once in interface")
                 if field.elem_type == "field_var":
                     ftype = self.type_from_name(fname)
                     finterface = self.interface_from_name(fname)
                     if finterface is not None and finterface not in self.interfaces:
-                        super().error(ErrorType.NAME_ERROR, "unknown interface in field var")
-                    fields_info[fname] = {"kind": "var", "type": ftype, "interface": finterface}
+                        self.error(ErrorType.NAME_ERROR, "unknown interface in field var")
+                    fields_info[fname] = (IFACE_VAR, ftype, finterface)
                 elif field.elem_type == "field_func":
                     params_info = []
                     for arg in field.get("params"):
@@ -541,14 +670,19 @@ class Interpreter(InterpreterBase):
                         ptype = self.type_from_name(pname)
                         pinterface = self.interface_from_name(pname)
                         if pinterface is not None and pinterface not in self.interfaces:
-                            super().error(ErrorType.NAME_ERROR, "unknown interface in field func param")
-                        params_info.append({"type":ptype, "interface":pinterface, "ref":arg.get("ref")})
-                    fields_info[fname] = {"kind": "func", "params": params_info}
+                            self.error(ErrorType.NAME_ERROR, "unknown interface in field func param")
+                        params_info.append((ptype, pinterface, arg.get("ref")))
+                    fields_info[fname] = (IFACE_FUNC, tuple(params_info))
                 else:
-                    super().error(ErrorType.NAME_ERROR, "unknown field type in interface")
-            self.interfaces[name] = {"fields": fields_info}
+                    self.error(ErrorType.NAME_ERROR, "unknown field type in interface")
+            self.interfaces[name] = tuple(fields_info.items())
     def __create_function_table(self, ast):
         self.funcs = {}
+        # every overload of each function name, in definition order
+        self._funcs_by_name = {}
+        # (name, number of params) -> ((param types, function), ...) in definition order
+        self._funcs_by_arity = {}
+        self._resolve_cache = {}
         for func in ast.get("functions"):
         #     self.funcs[(func.get("name"), len(func.get("args")))] = func
             name = func.get("name")
@@ -556,7 +690,7 @@ class Interpreter(InterpreterBase):
 
             if name == "main":
                 if len(args) != 0:
-                    super().error(ErrorType.NAME_ERROR, "main function cannot have parameters")
+                    self.error(ErrorType.NAME_ERROR, "main function cannot have parameters")
                 # return_suffix = "v"
                 return_type = Type.VOID
                 return_interface = None
@@ -586,47 +720,418 @@ class Interpreter(InterpreterBase):
                 arg.dict["interface"] = interface
                 param_types.append(ptype)
             func.dict["param_types"] = tuple(param_types)
+            func.dict["param_specs"] = self.__param_specs(args)
             key = (name, tuple(param_types))
             if key in self.funcs:
-                super().error(ErrorType.NAME_ERROR, "function defined more than once")
+                self.error(ErrorType.NAME_ERROR, "function defined more than once")
             self.funcs[key] = func
+            self._funcs_by_name.setdefault(name, []).append(func)
+            self._funcs_by_arity.setdefault((name, len(param_types)), []).append((key[1], func))
+
+    def __param_specs(self, args):
+        """(type, interface, ref) of each parameter, as compared against interface method specs"""
+        return tuple((arg.dict["declared_type"], arg.dict["interface"], arg.get("ref")) for arg in args)
 
     def __get_function(self, name: str, param_types: tuple[Type, ...]):
         # if (name, num_params) not in self.funcs:
-        #     super().error(ErrorType.NAME_ERROR, "function not found")
+        #     self.error(ErrorType.NAME_ERROR, "function not found")
         # return self.funcs[(name, num_params)]
         key = (name, param_types)
         if key not in self.funcs:
-            super().error(ErrorType.NAME_ERROR, "function not found")
+            self.error(ErrorType.NAME_ERROR, "function not found")
         return self.funcs[key]
 
-    def __run_vardef(self, statement):
-        name = statement.get("name")
+    def __compile_functions(self):
+        for func in self.funcs.values():
+            self.__compile_function(func)
+
+    def __compile_function(self, func):
+        """Lay out the variable slots of a function (or lambda) and compile its body"""
+        scope = Scope()
+        function_block = {}
+        # function-scope names are visible from anywhere in the body: var can be
+        # declared inside a nested block (e.g. on an earlier loop iteration)
+        for arg in func.get("args"):
+            self.__declare(scope, function_block, arg.get("name"), 0)
+        scope.param_slots = tuple(function_block[arg.get("name")] for arg in func.get("args"))
+        scope.self_slot = self.__declare(scope, function_block, "selfo", 0)
+        self.__declare_function_scope(scope, function_block, func.get("statements"), True)
+        func.dict["code"] = self.__compile_statements(func.get("statements"), scope, [function_block])
+        scope.finish()
+        func.dict["scope"] = scope
+
+    def __declare(self, scope, block, name, depth):
+        slot = block.get(name)
+        if slot is None:
+            slot = scope.new_slot(name, depth)
+            block[name] = slot
+        return slot
+
+    def __declare_function_scope(self, scope, function_block, statements, top_level):
+        for statement in statements:
+            kind = statement.elem_type
+            if kind == self.VAR_DEF_NODE or (top_level and kind == self.BVAR_DEF_NODE):
+                self.__declare(scope, function_block, statement.get("name"), 0)
+            elif kind == self.IF_NODE:
+                self.__declare_function_scope(scope, function_block, statement.get("statements"), False)
+                if statement.get("else_statements"):
+                    self.__declare_function_scope(scope, function_block, statement.get("else_statements"), False)
+            elif kind == self.WHILE_NODE:
+                self.__declare_function_scope(scope, function_block, statement.get("statements"), False)
 
-        vtype = self.type_from_name(name)
-        initial = self.default_value_for_type(vtype)
+    def __local_default(self, name):
+        """The shared initial value of a var/bvar, or None if its suffix is invalid"""
+        t = self.static_type_from_name(name)
+        return None if t is None else self.default_value_for_type(t)
 
-        # interface = self.interface_from_name(name)
-        # if interface is not None and initial.t in (Type.OBJECT, Type.FUNCTION):
-        #     setattr(initial, "interface", interface)
+    def __visible_slots(self, name, blocks):
+        return tuple(block[name] for block in reversed(blocks) if name in block)
+
+    def __compile_statements(self, statements, scope, blocks):
+        """Lower a statement list into (opcode, operands...) tuples, done once per program.
+
+        blocks holds the name -> slot maps of the enclosing blocks, function scope
+        first; a bvar only becomes visible to the statements that follow it.
+        """
+        code = []
+        for statement in statements:
+            kind = statement.elem_type
+            if kind == self.VAR_DEF_NODE:
+                name = statement.get("name")
+                code.append((OP_VARDEF, name, blocks[0][name], self.__local_default(name)))
+            elif kind == self.BVAR_DEF_NODE:
+                name = statement.get("name")
+                slot = self.__declare(scope, blocks[-1], name, len(blocks) - 1)
+                code.append((OP_BVARDEF, name, slot, self.__local_default(name)))
+            elif kind == self.ASSIGNMENT_NODE:
+                expr = statement.get("expression")
+                self.__compile_expr(expr, scope, blocks)
+                info = self.qname_info(statement.get("var"))
+                code.append((OP_ASSIGN, info, self.__visible_slots(info[0][0], blocks), self.__compile_py_expr(expr)))
+            elif kind == self.FCALL_NODE:
+                self.__compile_expr(statement, scope, blocks)
+                code.append((OP_FCALL, statement))
+            elif kind == self.IF_NODE:
+                cond = statement.get("condition")
+                self.__compile_expr(cond, scope, blocks)
+                inner = blocks + [{}]
+                then_code = self.__compile_statements(statement.get("statements"), scope, inner)
+                else_statements = statement.get("else_statements")
+                else_code = self.__compile_statements(else_statements, scope, inner) if else_statements else None
+                code.append((OP_IF, self.__compile_condition(cond), then_code, else_code, tuple(inner[-1].values())))
+            elif kind == self.WHILE_NODE:
+                cond = statement.get("condition")
+                self.__compile_expr(cond, scope, blocks)
+                inner = blocks + [{}]
+                body_code = self.__compile_statements(statement.get("statements"), scope, inner)
+                int_loop = self.__compile_int_loop(statement, blocks)
+                code.append((OP_WHILE, self.__compile_condition(cond), body_code, tuple(inner[-1].values()), int_loop))
+            elif kind == self.RETURN_NODE:
+                expr = statement.get("expression")
+                if expr is not None:
+                    self.__compile_expr(expr, scope, blocks)
+                    expr = self.__compile_py_expr(expr)
+                code.append((OP_RETURN, expr))
+            # any other expression statement has no effect and is never evaluated
+        return code
+
+    def __compile_expr(self, expr, scope, blocks):
+        """Resolve the variable slots used by an expression and compile any lambdas inside it"""
+        kind = expr.elem_type
+        if kind == self.FUNC_NODE:
+            self.__compile_function(expr)
+            return
+        for child in expr.dict.values():
+            if isinstance(child, list):
+                for item in child:
+                    if isinstance(item, Element):
+                        self.__compile_expr(item, scope, blocks)
+            elif isinstance(child, Element):
+                self.__compile_expr(child, scope, blocks)
+        # annotate after visiting the children: __target_func is itself an Element
+        if kind == self.QUALIFIED_NAME_NODE or kind == self.FCALL_NODE:
+            info = self.qname_info(expr.get("name"))
+            expr.dict["__qname"] = info
+            expr.dict["__slots"] = self.__visible_slots(info[0][0], blocks)
+        if kind == self.FCALL_NODE and expr.get("name") not in ("print", "inputi", "inputs"):
+            # __run_fcall handles the built-ins before it reads these
+            expr.dict["__target_func"] = self.__static_call_target(expr)
+            expr.dict["__eval_args"] = self.__compile_py_args(expr.dict["args"])
+
+    def __compile_py_expr(self, expr):
+        """Generate a Python function that evaluates expr by calling the node handlers directly.
+
+        Literals become prebuilt Values and every other node becomes a call to the
+        handler __eval_expr would dispatch to, so the tree is no longer walked (or
+        dispatched on) at run time. Anything the generator can't express falls back
+        to the tree walker.
+        """
+        namespace = self.__py_namespace()
+        try:
+            source = self.__py_expr_source(expr, namespace)
+            exec(compile(f"def py_expr():\n    return {source}", "<brewin expr>", "exec"), namespace)
+        except (SyntaxError, RecursionError, MemoryError):
+            return lambda: self.__eval_expr(expr)
+        return namespace["py_expr"]
+
+    def __compile_condition(self, cond):
+        """Like __compile_py_expr, but the result is checked to be a bool unless it always is"""
+        py_cond = self.__compile_py_expr(cond)
+        if self.static_expr_type(cond) == Type.BOOL:
+            return py_cond
+        bool_t = Type.BOOL
+        error = self.error
+
+        def checked_cond():
+            val = py_cond()
+            if val.t is not bool_t:
+                error(ErrorType.TYPE_ERROR, "condition must be boolean")
+            return val
+        return checked_cond
+
+    def __compile_py_args(self, args):
+        """Like __compile_py_expr, for the argument list of a call; also rejects void arguments"""
+        if not args:
+            return list
+        namespace = self.__py_namespace()
+        namespace["VOID"] = Type.VOID
+        namespace["void_arg"] = self.__void_argument
+        try:
+            # every argument is evaluated before any is checked, so errors keep their order
+            lines = [f"    a{i} = {self.__py_expr_source(arg, namespace)}" for i, arg in enumerate(args)]
+            names = [f"a{i}" for i in range(len(args))]
+            lines.append("    if " + " or ".join(f"{name}.t is VOID" for name in names) + ":")
+            lines.append("        void_arg()")
+            lines.append(f"    return [{', '.join(names)}]")
+            exec(compile("def py_args():\n" + "\n".join(lines), "<brewin args>", "exec"), namespace)
+        except (SyntaxError, RecursionError, MemoryError):
+            return lambda: self.__eval_args(args)
+        return namespace["py_args"]
+
+    def __eval_args(self, args):
+        n = len(args)
+        actual_args = [None] * n
+        eval_expr = self.__eval_expr
+        void = Type.VOID
+        has_void = False
+        for i in range(n):
+            val = eval_expr(args[i])
+            if val.t is void:
+                has_void = True
+            actual_args[i] = val
+        if has_void:
+            self.__void_argument()
+        return actual_args
+
+    def __void_argument(self):
+        self.error(ErrorType.TYPE_ERROR, "void value cannot be used as argument")
+
+    def __py_namespace(self):
+        return {
+            "binary_op": self.__eval_binary_op,
+            "eval_qname": self.__eval_qname,
+            "run_fcall": self.__run_fcall,
+            "eval_lambda": self.__eval_lambda,
+            "new_object": self.new_object,
+            "convert": self.convert_value,
+            "negate": self.__negate,
+            "logical_not": self.__logical_not,
+            "eval_expr": self.__eval_expr,
+        }
+
+    def __py_expr_source(self, expr, namespace):
+        kind = expr.elem_type
+        if kind == self.INT_NODE:
+            return self.__py_constant(self.int_value(expr.dict["val"]), namespace)
+        if kind == self.STRING_NODE:
+            return self.__py_constant(Value(Type.STRING, expr.dict["val"]), namespace)
+        if kind == self.BOOL_NODE:
+            return self.__py_constant(TRUE_V if expr.dict["val"] else FALSE_V, namespace)
+        if kind == self.NIL_NODE:
+            return self.__py_constant(NIL_OBJ_V, namespace)
+        if kind == self.EMPTY_OBJ_NODE:
+            return "new_object()"
+        if kind in self.bops:
+            left = self.__py_expr_source(expr.dict["op1"], namespace)
+            right = self.__py_expr_source(expr.dict["op2"], namespace)
+            return f"binary_op({kind!r}, {left}, {right})"
+        if kind == self.NEG_NODE:
+            return f"negate({self.__py_expr_source(expr.dict['op1'], namespace)})"
+        if kind == self.NOT_NODE:
+            return f"logical_not({self.__py_expr_source(expr.dict['op1'], namespace)})"
+        if kind == self.CONVERT_NODE:
+            return f"convert({expr.dict['to_type']!r}, {self.__py_expr_source(expr.dict['expr'], namespace)})"
+        node = self.__py_constant(expr, namespace)
+        if kind == self.QUALIFIED_NAME_NODE:
+            return f"eval_qname({node})"
+        if kind == self.FCALL_NODE:
+            return f"run_fcall({node})"
+        if kind == self.FUNC_NODE:
+            return f"eval_lambda({node})"
+        return f"eval_expr({node})"
+
+    def __py_constant(self, value, namespace):
+        name = f"k{len(namespace)}"
+        namespace[name] = value
+        return name
+
+    def __compile_int_loop(self, statement, blocks):
+        """Specialize a while loop that only does int arithmetic on plain int variables.
+
+        Such a loop is turned into a Python function that runs on unboxed ints:
+        it reads each variable's cell once, loops, and writes the results back.
+        Returns (function, ((name, visible slots), ...)), or None if the loop uses
+        anything else (calls, declarations, fields, returns, non-int variables).
+        """
+        variables = {}
+        assigned = set()
+        lines = []
+        namespace = {}
+        try:
+            self.__int_loop_source(statement, variables, assigned, lines, 1)
+            cell_args = "".join(f", c{i}" for i in variables.values())
+            source = [f"def int_loop(int_value{cell_args}):"]
+            source += [f"    v{i} = c{i}.value.v" for i in variables.values()]
+            source += lines
+            source += [f"    c{variables[name]}.value = int_value(v{variables[name]})" for name in variables if name in assigned]
+            exec(compile("\n".join(source), "<int loop>", "exec"), namespace)
+        except (_NotIntLoop, SyntaxError, RecursionError, MemoryError):
+            # not a plain int loop, or too deeply nested for Python's compiler:
+            # the generic loop still runs it
+            return None
+        visible = tuple((name, self.__visible_slots(name, blocks)) for name in variables)
+        return namespace["int_loop"], visible
+
+    def __int_loop_source(self, statement, variables, assigned, lines, depth):
+        indent = "    " * depth
+        kind = statement.elem_type
+        if kind == self.WHILE_NODE or kind == self.IF_NODE:
+            keyword = "while" if kind == self.WHILE_NODE else "if"
+            cond = self.__int_loop_expr(statement.get("condition"), variables, Type.BOOL)
+            lines.append(f"{indent}{keyword} {cond}:")
+            lines.append(f"{indent}    pass")
+            for inner in statement.get("statements"):
+                self.__int_loop_source(inner, variables, assigned, lines, depth + 1)
+            if kind == self.IF_NODE and statement.get("else_statements"):
+                lines.append(f"{indent}else:")
+                lines.append(f"{indent}    pass")
+                for inner in statement.get("else_statements"):
+                    self.__int_loop_source(inner, variables, assigned, lines, depth + 1)
+        elif kind == self.ASSIGNMENT_NODE:
+            name = statement.get("var")
+            value = self.__int_loop_expr(statement.get("expression"), variables, Type.INT)
+            target = self.__int_loop_variable(name, variables)
+            assigned.add(name)
+            lines.append(f"{indent}{target} = {value}")
+        else:
+            raise _NotIntLoop()
+
+    def __int_loop_variable(self, name, variables):
+        if "." in name or self.static_type_from_name(name) != Type.INT:
+            raise _NotIntLoop()
+        return f"v{variables.setdefault(name, len(variables))}"
+
+    def __int_loop_expr(self, expr, variables, expected):
+        """Python source for an int (or, for conditions, bool) expression over int variables"""
+        kind = expr.elem_type
+        if expected == Type.INT:
+            if kind == self.INT_NODE:
+                return repr(expr.get("val"))
+            if kind == self.QUALIFIED_NAME_NODE:
+                return self.__int_loop_variable(expr.get("name"), variables)
+            if kind == self.NEG_NODE:
+                return f"(-{self.__int_loop_expr(expr.get('op1'), variables, Type.INT)})"
+            if kind in INT_LOOP_ARITHMETIC:
+                left = self.__int_loop_expr(expr.get("op1"), variables, Type.INT)
+                right = self.__int_loop_expr(expr.get("op2"), variables, Type.INT)
+                return f"({left} {INT_LOOP_ARITHMETIC[kind]} {right})"
+        else:
+            if kind == self.BOOL_NODE:
+                return repr(expr.get("val"))
+            if kind == self.NOT_NODE:
+                return f"(not {self.__int_loop_expr(expr.get('op1'), variables, Type.BOOL)})"
+            if kind in INT_LOOP_COMPARISONS:
+                left = self.__int_loop_expr(expr.get("op1"), variables, Type.INT)
+                right = self.__int_loop_expr(expr.get("op2"), variables, Type.INT)
+                return f"({left} {kind} {right})"
+            if kind in INT_LOOP_LOGIC:
+                # & and | evaluate both sides, like Brewin's && and ||
+                left = self.__int_loop_expr(expr.get("op1"), variables, Type.BOOL)
+                right = self.__int_loop_expr(expr.get("op2"), variables, Type.BOOL)
+                return f"({left} {INT_LOOP_LOGIC[kind]} {right})"
+        raise _NotIntLoop()
+
+    def static_expr_type(self, expr):
+        """The type an expression always evaluates to, or None if that depends on runtime values"""
+        kind = expr.elem_type
+        if kind == self.INT_NODE or kind == self.NEG_NODE:
+            return Type.INT
+        if kind == self.STRING_NODE:
+            return Type.STRING
+        if kind == self.BOOL_NODE or kind == self.NOT_NODE:
+            return Type.BOOL
+        if kind == self.CONVERT_NODE:
+            return STATIC_CONVERT_TYPES.get(expr.get("to_type"))
+        if kind in ("==", "!=", "<", "<=", ">", ">=", "&&", "||"):
+            return Type.BOOL
+        if kind in ("-", "*", "/"):
+            return Type.INT
+        if kind == "+":
+            left = self.static_expr_type(expr.get("op1"))
+            if left is not None and left == self.static_expr_type(expr.get("op2")):
+                return left
+            return None
+        if kind == self.QUALIFIED_NAME_NODE:
+            parts, _, _, final_type, _ = expr.dict["__qname"]
+            # a bare name that isn't a variable evaluates to the function of that name
+            if len(parts) == 1 and parts[0] in self._funcs_by_name:
+                return None
+            if final_type in (Type.INT, Type.STRING, Type.BOOL):
+                return final_type
+            return None
+        if kind == self.FCALL_NODE:
+            name = expr.get("name")
+            if name == "inputi":
+                return Type.INT
+            if name == "inputs":
+                return Type.STRING
+        return None
 
-        if not self.env.fdef_function(name, initial):
-            super().error(ErrorType.NAME_ERROR, "variable already defined")
+    def __static_call_target(self, fcall):
+        """Resolve the overload a free-function call falls back to, if its argument types are static.
+
+        Only int/string/bool arguments qualify: they can never be nil, so they
+        match exactly one parameter type list. A variable of the same name still
+        takes precedence at run time.
+        """
+        name = fcall.get("name")
+        if "." in name or name not in self._funcs_by_name:
+            return None
+        arg_types = []
+        for arg in fcall.get("args"):
+            t = self.static_expr_type(arg)
+            if t not in (Type.INT, Type.STRING, Type.BOOL):
+                return None
+            arg_types.append(t)
+        return self.funcs.get((name, tuple(arg_types)))
+
+    def __run_vardef(self, ins):
+        # handles both var and bvar: they only differ in the slot they were compiled to
+        initial = ins[3]
+        if initial is None:
+            self.type_from_name(ins[1])  # invalid suffix: raises the type error
 
-    def __run_bvardef(self, statement):
-        name = statement.get("name")
-        vtype = self.type_from_name(name)
-        initial = self.default_value_for_type(vtype)
         # interface = self.interface_from_name(name)
         # if interface is not None and initial.t in (Type.OBJECT, Type.FUNCTION):
         #     setattr(initial, "interface", interface)
-        if not self.env.fdef_block(name, initial):
-            super().error(ErrorType.NAME_ERROR, "variable already defined")
 
-    def __run_assign(self, statement):
+        if not self.env.fdef_slot(ins[2], initial):
+            self.error(ErrorType.NAME_ERROR, "variable already defined")
+
+    def __run_assign(self, ins):
         # name = statement.get("var")
         # if not self.env.exists(name):
-        #     super().error(ErrorType.NAME_ERROR, "variable not defined")
+        #     self.error(ErrorType.NAME_ERROR, "variable not defined")
         # left_val = self.env.get(name)
         # left_type = left_val.t
         # right_val = self.__eval_expr(statement.get("expression"))
@@ -634,75 +1139,70 @@ class Interpreter(InterpreterBase):
 
         # if left_type == Type.OBJECT:
         #     if right_type != Type.OBJECT:
-        #         super().error(ErrorType.TYPE_ERROR, "cannot assign non-object to object variable")
+        #         self.error(ErrorType.TYPE_ERROR, "cannot assign non-object to object variable")
         # else:
         #     if left_type != right_type:
-        #         super().error(ErrorType.TYPE_ERROR, "type mismatch in assignment")
+        #         self.error(ErrorType.TYPE_ERROR, "type mismatch in assignment")
         # if not self.env.set(name, right_val):
-        #     super().error(ErrorType.NAME_ERROR, "variable not defined")
-        right_val = self.__eval_expr(statement.get("expression"))
-        qname = statement.get("var")
-        self.set_qname_value(qname, right_val)
+        #     self.error(ErrorType.NAME_ERROR, "variable not defined")
+        _, info, slots, py_expr = ins
+        right_val = py_expr()
+        self.set_qname_value(info, slots, right_val)
 
 
     def __handle_input(self, fcall_name, args):
         """Handle inputi and inputs function calls"""
         if len(args) > 1:
-            super().error(ErrorType.NAME_ERROR, "too many arguments for input function")
+            self.error(ErrorType.NAME_ERROR, "too many arguments for input function")
 
         if args:
             self.__handle_print(args)
 
-        res = super().get_input()
+        res = self.get_input()
 
         return (
-            Value(Type.INT, int(res))
+            self.int_value(int(res))
             if fcall_name == "inputi"
             else Value(Type.STRING, res)
         )
 
     def __handle_print(self, args):
         """Handle print function calls"""
-        out = ""
-
+        parts = []
+        append = parts.append
         for arg in args:
             c_out = self.__eval_expr(arg)
-            if c_out.t == Type.BOOL:
-                out += str(c_out.v).lower()
-            else:
-                out += str(c_out.v)
+            append(PRINT_FORMATTERS.get(c_out.t, str)(c_out.v))
 
-        super().output(out)
+        self.output("".join(parts))
 
-        return Value(Type.VOID, None)
+        return VOID_V
     
     def invoke_function(self, func_def, args_expr_nodes, actual_args_values, closure_env=None, self_object_value=None):
-        formal_params = func_def.get("args")
+        func_dict = func_def.dict
+        param_specs = func_dict["param_specs"]
 
-        if len(formal_params) != len(actual_args_values):
-            super().error(ErrorType.TYPE_ERROR, "wrong number of arguments")
+        if len(param_specs) != len(actual_args_values):
+            self.error(ErrorType.TYPE_ERROR, "wrong number of arguments")
 
+        scope = func_dict["scope"]
         bindings = []
-        for formal, argument_expression, argument_value in zip(formal_params, args_expr_nodes, actual_args_values):
-            pname = formal.get("name")
-            declared_type = formal.dict["declared_type"]
-            expected_interface = formal.dict["interface"]
-            is_ref = formal.get("ref")
+        for (declared_type, expected_interface, is_ref), slot, argument_expression, argument_value in zip(param_specs, scope.param_slots, args_expr_nodes, actual_args_values):
 
             # if argument_value.t != declared_type:
-            #     super().error(ErrorType.TYPE_ERROR, "argument type mismatch")
+            #     self.error(ErrorType.TYPE_ERROR, "argument type mismatch")
             bind_val = argument_value
             if argument_value.v is None and argument_value.t in (Type.OBJECT, Type.FUNCTION):
                 if declared_type in (Type.OBJECT, Type.FUNCTION):
-                    bind_val = Value(declared_type, None)
+                    bind_val = self.default_value_for_type(declared_type)
                 else:
-                    super().error(ErrorType.TYPE_ERROR, "arg type __mismatch 477")
+                    self.error(ErrorType.TYPE_ERROR, "arg type __mismatch 477")
             else:
                 if argument_value.t != declared_type:
-                    super().error(ErrorType.TYPE_ERROR, "argument type mismatch")
+                    self.error(ErrorType.TYPE_ERROR, "argument type mismatch")
             if expected_interface is not None:
                 if not self.object_satisfies_interface(expected_interface, bind_val):
-                    super().error(ErrorType.TYPE_ERROR, "argument interface mismatch")
+                    self.error(ErrorType.TYPE_ERROR, "argument interface mismatch")
 
             # value_interface = getattr(bind_val, "interface", None)
             # if(expected_interface is not None and value_interface is None and bind_val.v is not None and
@@ -710,59 +1210,61 @@ class Interpreter(InterpreterBase):
             #     setattr(bind_val, "interface", expected_interface)
             #     value_interface = expected_interface
             # if not self.compatible_interfaces(expected_interface, value_interface, bind_val):
-            #     super().error(ErrorType.TYPE_ERROR, "wouldnt u know :( there's an argument interface mismatch")
+            #     self.error(ErrorType.TYPE_ERROR, "wouldnt u know :( there's an argument interface mismatch")
 
             if is_ref:
                 if argument_expression.elem_type != self.QUALIFIED_NAME_NODE:
-                    super().error(ErrorType.TYPE_ERROR, "ref argument must be a variable")
-                actual_name = argument_expression.get("name")
+                    self.error(ErrorType.TYPE_ERROR, "ref argument must be a variable")
+                arg_info = self.resolve_qname(argument_expression)
 
                 if expected_interface is not None:
-                    arg_interface = self.interface_for_qname(actual_name)
+                    arg_interface = self.interface_for_qname(arg_info)
                     if arg_interface is not None and arg_interface != expected_interface:
-                        super().error(ErrorType.TYPE_ERROR, "argument interface mismatch on ref arg")
+                        self.error(ErrorType.TYPE_ERROR, "argument interface mismatch on ref arg")
 
-                cell = self.get_qname_cell(actual_name)
+                cell = self.get_qname_cell(arg_info, argument_expression.dict["__slots"])
                 if cell is None:
-                    super().error(ErrorType.NAME_ERROR, "variable not defined")
-                bindings.append(("ref", pname, cell))
+                    self.error(ErrorType.NAME_ERROR, "variable not defined")
+                bindings.append(("ref", slot, cell))
             else:
-                bindings.append(("val", pname, bind_val))
+                bindings.append(("val", slot, bind_val))
 
         previous_return_type = self.current_return_type
         previous_return_interface = self.current_return_interface
-        saved_env_stack = self.env.env
-
         if closure_env is not None:
-            self.env.env=closure_env
+            saved_env_stack = self.env.swap_stack(closure_env)
 
         self.current_return_type = func_def.dict["return_type"]
         self.current_return_interface = func_def.dict["return_interface"]
 
         try:
-            self.env.enter_func()
+            self.env.enter_func(scope)
             if self_object_value is not None:
-                if not self.env.fdef_function("selfo", self_object_value):
-                    super().error(ErrorType.NAME_ERROR, "selfo already defined? what ?????")
-            for kind, pname, val in bindings:
+                if not self.env.fdef_slot(scope.self_slot, self_object_value):
+                    self.error(ErrorType.NAME_ERROR, "selfo already defined? what ?????")
+            for kind, slot, val in bindings:
                 if kind == "val":
-                    if not self.env.fdef_function(pname, val):
-                        super().error(ErrorType.NAME_ERROR, "variable already defined")
+                    if not self.env.fdef_slot(slot, val):
+                        self.error(ErrorType.NAME_ERROR, "variable already defined")
                 else:
-                    if not self.env.fdef_function_cell(pname, val):
-                        super().error(ErrorType.NAME_ERROR, "variable already defined")
-            res, _ = self.__run_statements(func_def.get("statements"))
+                    if not self.env.fdef_slot_cell(slot, val):
+                        self.error(ErrorType.NAME_ERROR, "variable already defined")
+            res, ret = self.__run_statements(func_def.dict["code"])
+            if not ret:
+                # fell off the end: return the return type's default
+                res = self.default_value_for_type(self.current_return_type)
             self.env.exit_func()
         finally:
             if closure_env is not None:
-                self.env.env = saved_env_stack
+                self.env.swap_stack(saved_env_stack)
             self.current_return_type = previous_return_type
             self.current_return_interface = previous_return_interface
 
         return res
 
     def __run_fcall(self, func_call_ast):
-        fcall_name, args = func_call_ast.get("name"), func_call_ast.get("args")
+        call_dict = func_call_ast.dict
+        fcall_name, args = call_dict["name"], call_dict["args"]
 
         if fcall_name == "inputi" or fcall_name == "inputs":
             return self.__handle_input(fcall_name, args)
@@ -770,44 +1272,46 @@ class Interpreter(InterpreterBase):
         if fcall_name == "print":
             return self.__handle_print(args)
 
-        actual_args = [self.__eval_expr(a) for a in args]
-
-        for arg in actual_args:
-            if arg.t == Type.VOID:
-                super().error(ErrorType.TYPE_ERROR, "void value cannot be used as argument")
+        eval_args = call_dict.get("__eval_args")
+        actual_args = eval_args() if eval_args is not None else self.__eval_args(args)
 
-        has_frame = len(self.env.env)>0
-        is_dotted = "." in fcall_name
-        is_var = has_frame and(not is_dotted) and self.env.exists(fcall_name)
+        slots = call_dict.get("__slots")
+        owner_object_value = None
+        if "." in fcall_name:
+            func_cell, owner_object_value = self.get_qname_cell_and_owner(self.resolve_qname(func_call_ast), slots)
+        elif self.env.env:
+            # a variable holding a function takes precedence over a named function
+            func_cell = self.env.get_current_cell(fcall_name, slots)
+        else:
+            func_cell = None
 
-        if is_dotted or is_var:
-            if is_dotted:
-                func_cell, owner_object_value = self.get_qname_cell_and_owner(fcall_name)
-            else:
-                func_cell = self.get_qname_cell(fcall_name)
-                owner_object_value = None
-            func_val = func_cell.get()
+        if func_cell is not None:
+            func_val = func_cell.value
             if func_val.t != Type.FUNCTION:
-                super().error(ErrorType.TYPE_ERROR, "attempt to call a non-function")
+                self.error(ErrorType.TYPE_ERROR, "attempt to call a non-function")
             if func_val.v is None:
-                super().error(ErrorType.FAULT_ERROR, "calling nil func")
+                self.error(ErrorType.FAULT_ERROR, "calling nil func")
 
             fv: FunctionValue = func_val.v
             func_def = fv.func_ast
             param_types = fv.param_types
             if len(param_types) != len(actual_args):
-                super().error(ErrorType.TYPE_ERROR, "wrong number of arguments pal")
+                self.error(ErrorType.TYPE_ERROR, "wrong number of arguments pal")
             for ptype, argval in zip(param_types, actual_args):
                 if argval.t != ptype:
-                    super().error(ErrorType.TYPE_ERROR, "argument type doesnt match")
+                    self.error(ErrorType.TYPE_ERROR, "argument type doesnt match")
             return self.invoke_function(func_def, args, actual_args, closure_env=fv.closure_env,self_object_value=owner_object_value)
         else:
+            func_def = call_dict.get("__target_func")
+            if func_def is not None:
+                return self.invoke_function(func_def, args, actual_args, closure_env=None)
+            # the overload only depends on the argument types and which arguments are nil
+            key = (fcall_name, tuple([(arg.t, arg.v is None) for arg in actual_args]))
+            func_def = self._resolve_cache.get(key)
+            if func_def is not None:
+                return self.invoke_function(func_def, args, actual_args, closure_env=None)
             potential = []
-            for (fname, ptypes), func_def in self.funcs.items():
-                if fname != fcall_name:
-                    continue
-                if len(ptypes) != len(actual_args):
-                    continue
+            for ptypes, func_def in self._funcs_by_arity.get((fcall_name, len(actual_args)), ()):
                 match = True
                 for ptype, argval in zip(ptypes, actual_args):
                     is_nil_like = (argval.v is None and argval.t in (Type.OBJECT, Type.FUNCTION))
@@ -822,10 +1326,11 @@ class Interpreter(InterpreterBase):
                 if match:
                     potential.append(func_def)
             if len(potential) == 0:
-                super().error(ErrorType.NAME_ERROR, "function not found")
+                self.error(ErrorType.NAME_ERROR, "function not found")
             if len(potential) > 1:
-                super().error(ErrorType.NAME_ERROR, "ambiguous function call")
+                self.error(ErrorType.NAME_ERROR, "ambiguous function call")
             func_def = potential[0]
+            self._resolve_cache[key] = func_def
             return self.invoke_function(func_def, args, actual_args, closure_env=None)
 
             # param_types = []
@@ -838,128 +1343,107 @@ class Interpreter(InterpreterBase):
             # func_def = self.__get_function(fcall_name, param_types)
             # return self.invoke_function(func_def, args, actual_args)
 
-    def __run_if(self, statement):
-        cond = self.__eval_expr(statement.get("condition"))
-
-        if cond.t != Type.BOOL:
-            super().error(ErrorType.TYPE_ERROR, "condition must be boolean")
-
-        self.env.enter_block()
+    def __run_fcall_statement(self, ins):
+        self.__run_fcall(ins[1])
 
+    def __run_if(self, ins):
+        _, py_cond, then_code, else_code, block_slots = ins
         res, ret = None, False
 
-        if cond.v:
-            res, ret = self.__run_statements(statement.get("statements"))
-        elif statement.get("else_statements"):
-            res, ret = self.__run_statements(statement.get("else_statements"))
+        if py_cond().v:
+            res, ret = self.__run_statements(then_code)
+        elif else_code:
+            res, ret = self.__run_statements(else_code)
 
-        self.env.exit_block()
+        self.env.exit_block(block_slots)
 
         return res, ret
 
-    def __run_while(self, statement):
-        res, ret = Value(), False
-
-        while True:
-            cond = self.__eval_expr(statement.get("condition"))
-
-            if cond.t != Type.BOOL:
-                super().error(ErrorType.TYPE_ERROR, "condition must be boolean")
-
-            if not cond.v:
-                break
+    def __run_while(self, ins):
+        _, py_cond, body_code, block_slots, int_loop = ins
+        if int_loop is not None:
+            loop, variables = int_loop
+            get_current_cell = self.env.get_current_cell
+            cells = []
+            for name, slots in variables:
+                cell = get_current_cell(name, slots)
+                if cell is None or cell.value.t != Type.INT:
+                    break
+                cells.append(cell)
+            else:
+                # each variable must be its own cell: a ref param can alias another
+                if len(set(map(id, cells))) == len(cells):
+                    loop(self.int_value, *cells)
+                    return None, False
+        res, ret = None, False
+        run_statements = self.__run_statements
+        exit_block = self.env.exit_block
 
-            self.env.enter_block()
-            res, ret = self.__run_statements(statement.get("statements"))
-            self.env.exit_block()
+        # py_cond raises if a condition that isn't statically bool evaluates to a non-bool
+        while py_cond().v:
+            res, ret = run_statements(body_code)
+            exit_block(block_slots)
             if ret:
                 break
 
         return res, ret
     
     def capture_env_for_lambda(self):
-        captured_stack = []
-        for frame in self.env.env:
-            new_frame = []
-            for block in frame:
-                new_block = {}
-                for name, cell in block.items():
-                    val = cell.get()
-                    if val.t in (Type.INT, Type.STRING, Type.BOOL):
-                        new_block[name] = Cell(Value(val.t, val.v))
-                    else:
-                        new_block[name] = Cell(val)
-                new_frame.append(new_block)
-            captured_stack.append(new_frame)
-        return captured_stack
-
-    def __run_return(self, statement):
-        expr = statement.get("expression")
+        # a closure gets its own cells (assignments on either side stay separate), but
+        # Values are immutable so the cells can share them; objects stay shared by id
+        cell_t = Cell
+        return [
+            Frame(frame.scope, [None if cell is None else cell_t(cell.value) for cell in frame.slots])
+            for frame in self.env.env
+        ]
+
+    def __run_return(self, ins):
+        py_expr = ins[1]
         expected = self.current_return_type
         expected_interface = self.current_return_interface
 
-        if expr is None:
-            if expected == Type.VOID:
-                return (Value(Type.VOID, None), True)
-            else:
-                val = self.default_value_for_type(expected)
-                if expected_interface is not None and val.t in (Type.OBJECT, Type.FUNCTION):
-                    setattr(val, "interface", expected_interface)
-                return (val, True)
-        
-        value = self.__eval_expr(expr)
+        if py_expr is None:
+            return (self.default_value_for_type(expected), True)
+
+        value = py_expr()
         if expected == Type.VOID:
-            super().error(ErrorType.TYPE_ERROR, "void func cant return a value")
+            self.error(ErrorType.TYPE_ERROR, "void func cant return a value")
         # if value.t != expected:
-        #     super().error(ErrorType.TYPE_ERROR, "return type mismatch")
+        #     self.error(ErrorType.TYPE_ERROR, "return type mismatch")
         if value.v is None and value.t in (Type.OBJECT, Type.FUNCTION):
             if expected in (Type.OBJECT, Type.FUNCTION):
-                value = Value(expected, None)
+                value = self.default_value_for_type(expected)
             else:
-                super().error(ErrorType.TYPE_ERROR, "return type mismatch 616")
+                self.error(ErrorType.TYPE_ERROR, "return type mismatch 616")
         else:
             if value.t != expected:
-                super().error(ErrorType.TYPE_ERROR, "return type mismatch")
+                self.error(ErrorType.TYPE_ERROR, "return type mismatch")
         # value_interface = getattr(value, "interface", None)
         # if(expected_interface is not None and value_interface is None and value.v is not None and
         #    value.t in (Type.OBJECT, Type.FUNCTION)):
         #     setattr(value, "interface", expected_interface)
         #     value_interface = expected_interface
         # if not self.compatible_interfaces(expected_interface, value_interface, value):
-        #     super().error(ErrorType.TYPE_ERROR, "return interface mismatch")
+        #     self.error(ErrorType.TYPE_ERROR, "return interface mismatch")
         if expected_interface is not None:
             if not self.object_satisfies_interface(expected_interface, value):
-                super().error(ErrorType.TYPE_ERROR, "return interface mismatch")
+                self.error(ErrorType.TYPE_ERROR, "return interface mismatch")
         return (value, True)
 
-    def __run_statements(self, statements):
-        res = self.default_value_for_type(self.current_return_type)
+    def __run_statements(self, code):
+        """Run compiled statements; returns (value, True) once one returns, else (None, False)"""
+        res = None
         ret = False
-        
-
-        for statement in statements:
-            kind = statement.elem_type
-
-            if kind == self.VAR_DEF_NODE:
-                self.__run_vardef(statement)
-            elif kind == 'bvardef':
-                self.__run_bvardef(statement)
-            elif kind == "=":
-                self.__run_assign(statement)
-            elif kind == self.FCALL_NODE:
-                self.__run_fcall(statement)
-            elif kind == self.IF_NODE:
-                res1, ret1 = self.__run_if(statement)
-                if ret1:
-                    res, ret = res1, True
-                    break
-            elif kind == self.WHILE_NODE:
-                res1, ret1 = self.__run_while(statement)
-                if ret1:
-                    res, ret = res1, True
-                    break
-            elif kind == self.RETURN_NODE:
-                res, ret = self.__run_return(statement)
+        dispatch = self._dispatch
+
+        for ins in code:
+            op = ins[0]
+            if op < OP_IF:
+                dispatch[op](ins)
+                continue
+            res1, ret1 = dispatch[op](ins)
+            if ret1:
+                res, ret = res1, True
                 break
 
         return res, ret
@@ -971,12 +1455,12 @@ class Interpreter(InterpreterBase):
                 return val
             if t == Type.STRING:
                 try:
-                    return Value(Type.INT, int(val.v))
+                    return self.int_value(int(val.v))
                 except:
-                    super().error(ErrorType.TYPE_ERROR, "cannot convert string to int")
+                    self.error(ErrorType.TYPE_ERROR, "cannot convert string to int")
             if t == Type.BOOL:
-                return Value(Type.INT, 1 if val.v else 0)
-            super().error(ErrorType.TYPE_ERROR, "invalid conversion to int")
+                return self.int_value(1 if val.v else 0)
+            self.error(ErrorType.TYPE_ERROR, "invalid conversion to int")
 
         if to_type == "str":
             if t == Type.STRING:
@@ -985,20 +1469,28 @@ class Interpreter(InterpreterBase):
                 return Value(Type.STRING, str(val.v))
             if t == Type.BOOL:
                 return Value(Type.STRING, "true" if val.v else "false")
-            super().error(ErrorType.TYPE_ERROR, "invalid conversion to string")
+            self.error(ErrorType.TYPE_ERROR, "invalid conversion to string")
 
         if to_type == "bool":
             if t == Type.BOOL:
                 return val
             if t == Type.INT:
-                return Value(Type.BOOL, val.v != 0)
+                return TRUE_V if val.v != 0 else FALSE_V
             if t == Type.STRING:
-                return Value(Type.BOOL, val.v != "")
-            super().error(ErrorType.TYPE_ERROR, "invalid conversion to bool")
-        super().error(ErrorType.TYPE_ERROR, "unknown conversion type")
+                return TRUE_V if val.v != "" else FALSE_V
+            self.error(ErrorType.TYPE_ERROR, "invalid conversion to bool")
+        self.error(ErrorType.TYPE_ERROR, "unknown conversion type")
 
     def __eval_binary_op(self, kind, vl, vr):
         """Evaluate binary operations"""
+        op = self._binops.get((kind, vl.t, vr.t))
+        if op is not None:
+            return op(vl.v, vr.v)
+        if kind == "==" or kind == "!=":
+            return self.__eval_equality(kind, vl, vr)
+        self.error(ErrorType.TYPE_ERROR, "invalid binary operation")
+
+    def __eval_equality(self, kind, vl, vr):
         tl, tr = vl.t, vr.t
         vl_val, vr_val = vl.v, vr.v
 
@@ -1006,200 +1498,172 @@ class Interpreter(InterpreterBase):
         #     return Value(Type.BOOL, tl == tr and vl_val == vr_val)
         # if kind == "!=":
         #     return Value(Type.BOOL, not (tl == tr and vl_val == vr_val))
-        if kind == "==" or kind == "!=":
-            if self.is_nil_value(vl) and self.is_nil_value(vr):
-                eq = True
-            elif self.is_nil_value(vl) or self.is_nil_value(vr):
-                eq = False
-            elif tl == Type.OBJECT and tr == Type.OBJECT:
-                eq = (vl_val == vr_val)
-            elif tl == Type.FUNCTION and tr == Type.FUNCTION:
-                fvl:FunctionValue = vl_val
-                fvr:FunctionValue = vr_val
-
-                is_lambda_l = (fvl.func_ast.elem_type == self.FUNC_NODE)
-                is_lambda_r = (fvr.func_ast.elem_type == self.FUNC_NODE)
-                # eq = (fvl.func_ast is fvr.func_ast and fvl.param_types == fvr.param_types)
-                # eq = (vl_val is vr_val) #come back to this!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
-
-                if is_lambda_l and is_lambda_r:
-                    eq = (fvl is fvr)
-                elif (not is_lambda_l) and (not is_lambda_r):
-                    eq = (fvl.func_ast is fvr.func_ast and fvl.param_types == fvr.param_types)
-                else:
-                    eq = False
-
-                # if (fvl.func_ast.elem_type == self.FUNC_NODE and
-                #     fvr.func_ast.elem_type == self.FUNC_NODE):
-                #     eq = (fvl is fvr)
-                # elif (fvl.func_ast.elem_type != self.FUNC_NODE and
-                #       fvr.func_ast.elem_type != self.FUNC_NODE):
-                #     eq = (fvl.func_ast is fvr.func_ast)
-                # else:
-                #     eq = False
-                if kind == "!=":
-                    eq = not eq
-                return Value(Type.BOOL, eq)
-            elif tl == tr:
-                eq = (vl_val == vr_val)
+        if self.is_nil_value(vl) and self.is_nil_value(vr):
+            eq = True
+        elif self.is_nil_value(vl) or self.is_nil_value(vr):
+            eq = False
+        elif tl == Type.OBJECT and tr == Type.OBJECT:
+            eq = (vl_val == vr_val)
+        elif tl == Type.FUNCTION and tr == Type.FUNCTION:
+            fvl:FunctionValue = vl_val
+            fvr:FunctionValue = vr_val
+
+            is_lambda_l = (fvl.func_ast.elem_type == self.FUNC_NODE)
+            is_lambda_r = (fvr.func_ast.elem_type == self.FUNC_NODE)
+            # eq = (fvl.func_ast is fvr.func_ast and fvl.param_types == fvr.param_types)
+            # eq = (vl_val is vr_val) #come back to this!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
+
+            if is_lambda_l and is_lambda_r:
+                eq = (fvl is fvr)
+            elif (not is_lambda_l) and (not is_lambda_r):
+                eq = (fvl.func_ast is fvr.func_ast and fvl.param_types == fvr.param_types)
             else:
                 eq = False
+
+            # if (fvl.func_ast.elem_type == self.FUNC_NODE and
+            #     fvr.func_ast.elem_type == self.FUNC_NODE):
+            #     eq = (fvl is fvr)
+            # elif (fvl.func_ast.elem_type != self.FUNC_NODE and
+            #       fvr.func_ast.elem_type != self.FUNC_NODE):
+            #     eq = (fvl.func_ast is fvr.func_ast)
+            # else:
+            #     eq = False
             if kind == "!=":
                 eq = not eq
-            return Value(Type.BOOL, eq)
-            # if tl != tr:
-            #     eq = False
-            # else:
-            #     if tl == Type.OBJECT:
-            #         if vl_val is None and vr_val is None:
-            #             eq = True
-            #         elif vl_val is None or vr_val is None:
-            #             eq = False
-            #         else:
-            #             eq = (vl_val == vr_val)
-            #     else:
-            #         eq = (vl_val == vr_val)
-            # if kind == "==":
-            #     return Value(Type.BOOL, eq)
-            # else:
-            #     return Value(Type.BOOL, not eq)
-
-        if tl == Type.STRING and tr == Type.STRING:
-            if kind == "+":
-                return Value(Type.STRING, vl_val + vr_val)
-
-        if tl == Type.INT and tr == Type.INT:
-            if kind == "+":
-                return Value(Type.INT, vl_val + vr_val)
-            if kind == "-":
-                return Value(Type.INT, vl_val - vr_val)
-            if kind == "*":
-                return Value(Type.INT, vl_val * vr_val)
-            if kind == "/":
-                return Value(Type.INT, vl_val // vr_val)
-            if kind == "<":
-                return Value(Type.BOOL, vl_val < vr_val)
-            if kind == "<=":
-                return Value(Type.BOOL, vl_val <= vr_val)
-            if kind == ">":
-                return Value(Type.BOOL, vl_val > vr_val)
-            if kind == ">=":
-                return Value(Type.BOOL, vl_val >= vr_val)
-
-        if tl == Type.BOOL and tr == Type.BOOL:
-            if kind == "&&":
-                return Value(Type.BOOL, vl_val and vr_val)
-            if kind == "||":
-                return Value(Type.BOOL, vl_val or vr_val)
-
-        super().error(ErrorType.TYPE_ERROR, "invalid binary operation")
+            return TRUE_V if eq else FALSE_V
+        elif tl == tr:
+            eq = (vl_val == vr_val)
+        else:
+            eq = False
+        if kind == "!=":
+            eq = not eq
+        return TRUE_V if eq else FALSE_V
+        # if tl != tr:
+        #     eq = False
+        # else:
+        #     if tl == Type.OBJECT:
+        #         if vl_val is None and vr_val is None:
+        #             eq = True
+        #         elif vl_val is None or vr_val is None:
+        #             eq = False
+        #         else:
+        #             eq = (vl_val == vr_val)
+        #     else:
+        #         eq = (vl_val == vr_val)
+        # if kind == "==":
+        #     return Value(Type.BOOL, eq)
+        # else:
+        #     return Value(Type.BOOL, not eq)
 
     def __eval_expr(self, expr):
-        kind = expr.elem_type
-
-        if kind == self.FUNC_NODE:
-            lambda_name = expr.get("name")
-            return_suffix = lambda_name[-1]
-            if return_suffix.isupper() and len(return_suffix) == 1:
-                return_type = Type.OBJECT
-                return_interface = return_suffix
+        handler = self._expr_dispatch.get(expr.elem_type)
+        if handler is None:
+            raise Exception("should not get here!")
+        return handler(expr)
+
+    def __eval_lambda(self, expr):
+        param_types = expr.dict.get("param_types")
+        if param_types is None:
+            # first evaluation of this lambda: its signature is the same every time
+            param_types = self.__resolve_lambda_signature(expr)
+        fv = FunctionValue(expr, param_types, closure_env=self.capture_env_for_lambda())
+        return Value(Type.FUNCTION, fv)
+
+    def __resolve_lambda_signature(self, expr):
+        lambda_name = expr.get("name")
+        return_suffix = lambda_name[-1]
+        if return_suffix.isupper() and len(return_suffix) == 1:
+            return_type = Type.OBJECT
+            return_interface = return_suffix
+        else:
+            return_type = self.type_from_suffix(return_suffix, is_func=True)
+            return_interface = None
+        expr.dict["return_type"] = return_type
+        expr.dict["return_interface"] = return_interface
+        param_types: list[Type] = []
+        for arg in expr.get("args"):
+            pname = arg.get("name")
+            psuffix = pname[-1]
+            if psuffix.isupper() and len(psuffix) == 1:
+                ptype = Type.OBJECT
+                interface = psuffix
             else:
-                return_type = self.type_from_suffix(return_suffix, is_func=True)
-                return_interface = None
-            expr.dict["return_type"] = return_type
-            expr.dict["return_interface"] = return_interface
-            param_types: list[Type] = []
-            for arg in expr.get("args"):
-                pname = arg.get("name")
-                psuffix = pname[-1]
-                if psuffix.isupper() and len(psuffix) == 1:
-                    ptype = Type.OBJECT
-                    interface = psuffix
-                else:
-                    ptype = self.type_from_suffix(psuffix, is_func=False)
-                    interface = None
-                arg.dict["declared_type"] = ptype
-                arg.dict["interface"] = interface
-                param_types.append(ptype)
-            expr.dict["param_types"] = tuple(param_types)
-            closure_env = self.capture_env_for_lambda()
-            fv = FunctionValue(expr, tuple(param_types), closure_env=closure_env)
-            return Value(Type.FUNCTION, fv)
-
-        if kind == self.INT_NODE:
-            return Value(Type.INT, expr.get("val"))
-
-        if kind == self.STRING_NODE:
-            return Value(Type.STRING, expr.get("val"))
-
-        if kind == self.BOOL_NODE:
-            return Value(Type.BOOL, expr.get("val"))
-
-        if kind == self.NIL_NODE:
-            return Value(Type.OBJECT, None)
-        
-        if kind == '@':
-            return self.new_object()
-        
-        if kind == "convert":
-            target = expr.get("to_type")
-            innver_val = self.__eval_expr(expr.get("expr"))
-            return self.convert_value(target, innver_val)
-
-        if kind == self.QUALIFIED_NAME_NODE:
-            # var_name = expr.get("name")
-
-            # if not self.env.exists(var_name):
-            #     super().error(ErrorType.NAME_ERROR, "variable not defined")
-            # return self.env.get(var_name)
-            qname = expr.get("name")
-            if "." in qname:
-                return self.get_qname_value(qname)
-            if self.env.exists(qname):
-                return self.get_qname_value(qname)
-            return self.make_named_function_value(qname)
-            # return self.get_qname_value(qname)
-
-        if kind == self.FCALL_NODE:
-            return self.__run_fcall(expr)
-
-        if kind in self.bops:
-            l, r = self.__eval_expr(expr.get("op1")), self.__eval_expr(expr.get("op2"))
-            return self.__eval_binary_op(kind, l, r)
-
-        if kind == self.NEG_NODE:
-            o = self.__eval_expr(expr.get("op1"))
-            if o.t == Type.INT:
-                return Value(Type.INT, -o.v)
-
-            super().error(ErrorType.TYPE_ERROR, "cannot negate non-integer")
-
-        if kind == self.NOT_NODE:
-            o = self.__eval_expr(expr.get("op1"))
-            if o.t == Type.BOOL:
-                return Value(Type.BOOL, not o.v)
-
-            super().error(ErrorType.TYPE_ERROR, "cannot apply NOT to non-boolean")
-
-        raise Exception("should not get here!")
+                ptype = self.type_from_suffix(psuffix, is_func=False)
+                interface = None
+            arg.dict["declared_type"] = ptype
+            arg.dict["interface"] = interface
+            param_types.append(ptype)
+        expr.dict["param_specs"] = self.__param_specs(expr.get("args"))
+        expr.dict["param_types"] = tuple(param_types)
+        return expr.dict["param_types"]
+
+    def __eval_int(self, expr):
+        return self.int_value(expr.dict["val"])
+
+    def __eval_string(self, expr):
+        return Value(Type.STRING, expr.dict["val"])
+
+    def __eval_bool(self, expr):
+        return TRUE_V if expr.dict["val"] else FALSE_V
+
+    def __eval_nil(self, expr):
+        return NIL_OBJ_V
+
+    def __eval_new_object(self, expr):
+        return self.new_object()
+
+    def __eval_convert(self, expr):
+        target = expr.dict["to_type"]
+        innver_val = self.__eval_expr(expr.dict["expr"])
+        return self.convert_value(target, innver_val)
+
+    def __eval_qname(self, expr):
+        expr_dict = expr.dict
+        info = expr_dict["__qname"]
+        slots = expr_dict["__slots"]
+        parts = info[0]
+        if len(parts) > 1:
+            return self.get_qname_value(info, slots)
+        frame_slots = self.env.slots
+        for slot in slots:
+            cell = frame_slots[slot]
+            if cell is not None:
+                return cell.value
+        cell = self.env.get_current_cell(parts[0], slots)
+        if cell is not None:
+            return cell.value
+        return self.make_named_function_value(parts[0])
+
+    def __eval_binary(self, expr):
+        expr_dict = expr.dict
+        l, r = self.__eval_expr(expr_dict["op1"]), self.__eval_expr(expr_dict["op2"])
+        return self.__eval_binary_op(expr.elem_type, l, r)
+
+    def __eval_neg(self, expr):
+        return self.__negate(self.__eval_expr(expr.dict["op1"]))
+
+    def __negate(self, o):
+        if o.t == Type.INT:
+            return self.int_value(-o.v)
+
+        self.error(ErrorType.TYPE_ERROR, "cannot negate non-integer")
+
+    def __eval_not(self, expr):
+        return self.__logical_not(self.__eval_expr(expr.dict["op1"]))
+
+    def __logical_not(self, o):
+        if o.t == Type.BOOL:
+            return FALSE_V if o.v else TRUE_V
+
+        self.error(ErrorType.TYPE_ERROR, "cannot apply NOT to non-boolean")
     
     def type_from_name(self, name: str) -> Type:
-        suffix = name[-1]
-        if suffix == "i":
-            return Type.INT
-        if suffix == "s":
-            return Type.STRING
-        if suffix == "b":
-            return Type.BOOL
-        if suffix =="o":
-            return Type.OBJECT
-        if suffix == "f":
-            return Type.FUNCTION
-        if suffix.isupper() and len(suffix) == 1:
-            return Type.OBJECT
-        if suffix == "v":
-            super().error(ErrorType.TYPE_ERROR, "cannot have variable of void type")
-        super().error(ErrorType.TYPE_ERROR, "unknown type suffix")
+        t = self.static_type_from_name(name)
+        if t is not None:
+            return t
+        if name[-1] == "v":
+            self.error(ErrorType.TYPE_ERROR, "cannot have variable of void type")
+        self.error(ErrorType.TYPE_ERROR, "unknown type suffix")
 
 
 def main():
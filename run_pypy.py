@@ -0,0 +1,64 @@
+"""
+Runs a Brewin program under PyPy when it is installed, falling back to whatever
+Python is running this script otherwise.
+
+Usage: python run_pypy.py [program.br]   (defaults to ./test.br, like interpreterv4.main)
+"""
+
+import os
+import platform
+import shutil
+import sys
+
+PYPY_EXECUTABLES = ("pypy3", "pypy")
+
+# A small program that exercises calls, loops, and arithmetic so the tracing JIT
+# has already compiled the interpreter's hot paths before the real program runs.
+WARMUP_PROGRAM = """
+def stepi(xi) {
+  return xi + 1;
+}
+
+def main() {
+  var ii;
+  while (ii < 200) {
+    ii = stepi(ii);
+  }
+}
+"""
+
+
+def find_pypy():
+    for name in PYPY_EXECUTABLES:
+        path = shutil.which(name)
+        if path is not None:
+            return path
+    return None
+
+
+def reexec_under_pypy():
+    if platform.python_implementation() == "PyPy":
+        return
+    pypy = find_pypy()
+    if pypy is None:
+        return
+    os.execv(pypy, [pypy, os.path.abspath(__file__)] + sys.argv[1:])
+
+
+def main():
+    reexec_under_pypy()
+
+    from interpreterv4 import Interpreter
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "./test.br"
+    with open(path, "r") as f:
+        program = f.read()
+
+    if platform.python_implementation() == "PyPy":
+        Interpreter(console_output=False).run(WARMUP_PROGRAM)
+
+    Interpreter().run(program)
+
+
+if __name__ == "__main__":
+    main()